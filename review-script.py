@@ -13,14 +13,332 @@ import yaml
 import re
 import sys
 import os
-from typing import Dict, List, Tuple, Any, Optional
+import io
+import time
+from typing import Dict, FrozenSet, Iterator, List, Tuple, Any, Optional
 from pathlib import Path
 from dataclasses import dataclass
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+
+# 优先使用libyaml的C实现加载器，未编译libyaml时回退到纯Python实现
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
+# 优先使用orjson解析JSON（直接接受UTF-8字节），未安装时回退到标准库
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# 可选：安装了numba时，大文件的YAML缩进检查改用编译后的逐字节扫描，其余情况使用正则扫描。
+# numpy/numba的导入和JIT编译开销远大于小文件的正则扫描，因此只在第一次遇到大文件时才加载，见_get_indent_kernel
+_INDENT_KERNEL_MIN_BYTES = 1 << 20
+
+
+# 扫描时直接跳过的目录（版本控制、依赖、虚拟环境、构建产物、缓存等）
+_SKIP_DIRS = {
+    '.git', 'node_modules', '.venv', 'venv', '__pycache__',
+    'dist', 'build', 'target', '.tox', '.mypy_cache'
+}
+
+# 目录扫描的默认最大深度
+_MAX_SCAN_DEPTH = 10
+
+# 目录扫描线程数：scandir以系统调用为主，线程数可以远多于CPU核数
+_SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# 目录扫描结果的磁盘缓存（$XDG_CACHE_HOME/enaas-reviewer/scan.json），按扫描根目录和最大深度分别保存；
+# 扫描规则变化时提升版本号使旧缓存失效。缓存中保存的是绝对路径，可用--no-scan-cache或设置该环境变量关闭
+_SCAN_CACHE_VERSION = 1
+_SCAN_CACHE_DISABLE_ENV = 'ENAAS_REVIEWER_NO_SCAN_CACHE'
+_SCAN_CACHE_MAX_ROOTS = 16
+# 修改时间距扫描开始不足该值的目录可能在同一时间戳内再次变化，此时不写缓存
+_SCAN_CACHE_RACY_NS = 2 * 10**9
+
+# 配置文件命名后缀
+_SECRET_SUFFIXES = ('_secret.yml', '_secret.yaml')
+_DC_SUFFIXES = ('_dc.yml', '_dc.yaml')
+
+# enaas.json必需的顶层键
+_REQUIRED_ENAAS_KEY_ORDER = ('keys', 'autoKeys', 'encodedKeys')
+_REQUIRED_ENAAS_KEYS = frozenset(_REQUIRED_ENAAS_KEY_ORDER)
+
+# ENAAS占位符：<ENAAS_PLACEHOLDER>内容<ENAAS_PLACEHOLDER>
+_PH_TAG = '<ENAAS_PLACEHOLDER>'
+_PH_RE = re.compile(re.escape(_PH_TAG) + r'(.*?)' + re.escape(_PH_TAG))
+
+# YAML缩进检查（作用于原始字节，一次扫描只匹配有问题的行；注释行和只有空白的行不参与检查）
+# 缩进中含Tab，或缩进宽度为奇数且不是缩进的注释行：group(1)为完整缩进
+_INDENT_ISSUE_RE = re.compile(
+    rb'^(?=[ \t]*\t|(?:[ \t][ \t])*[ \t][^ \t\r\n#])([ \t]+)(?=[^ \t\r\n])', re.M
+)
+
+
+def _strip_suffix(name: str, suffixes: Tuple[str, ...]) -> str:
+    """去掉文件名末尾匹配到的第一个后缀，没有匹配时原样返回"""
+    for suffix in suffixes:
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+def _as_lookup(items: List[Any]) -> Any:
+    """把列表转为集合以便O(1)成员判断；含有不可哈希的元素时原样返回"""
+    try:
+        return set(items)
+    except TypeError:
+        return items
+
+
+def _build_line_starts(text: str) -> List[int]:
+    """构建每行起始偏移表，配合_offset_to_line_col使用"""
+    line_starts = [0]
+    pos = text.find('\n')
+    while pos != -1:
+        line_starts.append(pos + 1)
+        pos = text.find('\n', pos + 1)
+    return line_starts
+
+
+def _offset_to_line_col(line_starts: List[int], pos: int) -> Tuple[int, int]:
+    """通过二分查找把字符偏移换算为(行号, 列号)，均从1开始"""
+    line_no = bisect_right(line_starts, pos)
+    return line_no, pos - line_starts[line_no - 1] + 1
+
+
+def _iter_line_matches(pattern: re.Pattern, data: bytes) -> Iterator[Tuple[int, re.Match]]:
+    """按顺序产出(行号, 匹配)，行号从上一个匹配处增量计数换行得到"""
+    line_no = 1
+    last_pos = 0
+    for match in pattern.finditer(data):
+        pos = match.start()
+        line_no += data.count(b'\n', last_pos, pos)
+        last_pos = pos
+        yield line_no, match
+
+
+def _scan_dir_entries(dir_path: str) -> Optional[Tuple[int, List[str], Optional[str], Optional[str], Optional[str]]]:
+    """扫描单个目录，返回(目录修改时间, 子目录列表, enaas文件名, secret文件名, dc文件名)；无权限时返回None"""
+    # 单次scandir同时完成两件事：收集子目录（跳过隐藏目录和已知的无关目录），
+    # 以及按文件名后缀挑出enaas/secret/dc文件；同名后缀.yml优先于.yaml。
+    # DirEntry复用dirent中的类型信息，避免逐项stat
+    subdirs = []
+    enaas_name = secret_name = dc_name = None
+    try:
+        # 先取修改时间再列目录：扫描期间目录若有变化，记录的时间只会偏旧，缓存随之失效
+        mtime_ns = os.stat(dir_path).st_mtime_ns
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                name = entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if not name.startswith('.') and name not in _SKIP_DIRS:
+                        subdirs.append(entry.path)
+                    continue
+                
+                if name.endswith(_SECRET_SUFFIXES):
+                    if secret_name is None or (secret_name.endswith('.yaml') and name.endswith('.yml')):
+                        secret_name = name
+                elif name.endswith(_DC_SUFFIXES):
+                    if dc_name is None or (dc_name.endswith('.yaml') and name.endswith('.yml')):
+                        dc_name = name
+                elif enaas_name is None and name.endswith('.json') and 'enaas' in name.lower():
+                    enaas_name = name
+    except PermissionError:
+        # 跳过无权限的目录
+        return None
+    return mtime_ns, subdirs, enaas_name, secret_name, dc_name
+
+
+def _scan_cache_file() -> str:
+    """目录扫描缓存文件路径，遵循XDG规范（$XDG_CACHE_HOME未设置或不是绝对路径时使用~/.cache）"""
+    cache_home = os.environ.get('XDG_CACHE_HOME', '')
+    if not os.path.isabs(cache_home):
+        cache_home = os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'enaas-reviewer', 'scan.json')
+
+
+def _is_valid_scan_entry(entry: Any) -> bool:
+    """检查缓存中单个扫描根目录的记录结构是否完整（缓存文件可能被其他版本写入或被手工改动）"""
+    if not isinstance(entry, dict):
+        return False
+    dirs = entry.get('dirs')
+    hits = entry.get('hits')
+    if not isinstance(dirs, dict) or not isinstance(hits, list):
+        return False
+    if not all(type(mtime_ns) is int for mtime_ns in dirs.values()):
+        return False
+    return all(
+        isinstance(hit, list) and len(hit) == 4
+        and isinstance(hit[0], str) and isinstance(hit[1], str)
+        and all(name is None or isinstance(name, str) for name in hit[2:])
+        for hit in hits
+    )
+
+
+def _load_scan_cache() -> Dict[str, Any]:
+    """读取目录扫描缓存；文件不存在、损坏或版本不符时返回空缓存，结构不完整的记录直接丢弃"""
+    try:
+        with open(_scan_cache_file(), 'rb') as f:
+            cache = _json_loads(f.read())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get('version') != _SCAN_CACHE_VERSION:
+        return {}
+    roots = cache.get('roots')
+    if not isinstance(roots, dict):
+        roots = {}
+    cache['roots'] = {key: entry for key, entry in roots.items() if _is_valid_scan_entry(entry)}
+    return cache
+
+
+def _save_scan_cache(cache: Dict[str, Any]):
+    """写入目录扫描缓存（先写临时文件再替换，并发运行时不会读到半个文件）；写入失败时忽略。
+    缓存只用于加速，任何写入错误都不能影响检查结果"""
+    cache['version'] = _SCAN_CACHE_VERSION
+    cache_file = _scan_cache_file()
+    tmp_path = f"{cache_file}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_file)
+    except (OSError, ValueError):
+        # ValueError：目录名不是合法UTF-8时，scandir返回的路径含代理字符，无法编码写入，本次不缓存
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def _dirs_unchanged(dir_mtimes: Dict[str, int]) -> bool:
+    """检查缓存记录的每个目录修改时间是否仍然一致（增删文件或子目录都会改变所在目录的修改时间）"""
+    try:
+        return all(os.stat(dir_path).st_mtime_ns == mtime_ns for dir_path, mtime_ns in dir_mtimes.items())
+    except OSError:
+        return False
+
+
+# 编译后的缩进扫描函数：未加载时为None，加载失败（未安装numba）时为False
+_indent_kernel = None
+
+
+def _get_indent_kernel():
+    """第一次调用时导入numpy/numba并定义缩进扫描函数；未安装numba时返回None"""
+    global _indent_kernel
+    if _indent_kernel is None:
+        try:
+            _indent_kernel = _build_indent_kernel()
+        except ImportError:
+            _indent_kernel = False
+    return _indent_kernel or None
+
+
+def _build_indent_kernel():
+    """定义并返回numba编译的缩进扫描函数"""
+    import numpy as np
+    from numba import njit
+
+    @njit(cache=True)
+    def _scan_indent_kernel(buf, n_lines):
+        """逐字节扫描行首空白，返回(Tab行号, Tab列号, 奇数缩进行号, 缩进宽度)四个数组；
+        判定规则与_INDENT_ISSUE_RE一致。每行最多一条结果，数组按行数n_lines分配"""
+        n = len(buf)
+        tab_lines = np.empty(n_lines, np.int64)
+        tab_cols = np.empty(n_lines, np.int64)
+        odd_lines = np.empty(n_lines, np.int64)
+        odd_widths = np.empty(n_lines, np.int64)
+        n_tab = 0
+        n_odd = 0
+        line_no = 1
+        i = 0
+        while i < n:
+            # 行首为'#'的注释行不检查
+            if buf[i] != 35:  # '#'
+                j = i
+                tab_pos = -1
+                while j < n and (buf[j] == 32 or buf[j] == 9):
+                    if buf[j] == 9 and tab_pos < 0:
+                        tab_pos = j - i
+                    j += 1
+                # 只有空白的行不检查
+                if j < n and buf[j] != 10 and buf[j] != 13:
+                    if tab_pos >= 0:
+                        tab_lines[n_tab] = line_no
+                        tab_cols[n_tab] = tab_pos + 1
+                        n_tab += 1
+                    # 缩进的注释行不计入奇数缩进
+                    if (j - i) % 2 == 1 and buf[j] != 35:
+                        odd_lines[n_odd] = line_no
+                        odd_widths[n_odd] = j - i
+                        n_odd += 1
+                i = j
+            # 跳到下一行
+            while i < n and buf[i] != 10:
+                i += 1
+            i += 1
+            line_no += 1
+        return tab_lines[:n_tab], tab_cols[:n_tab], odd_lines[:n_odd], odd_widths[:n_odd]
+
+    def scan(data: bytes):
+        return _scan_indent_kernel(np.frombuffer(data, dtype=np.uint8), data.count(b'\n') + 1)
+
+    return scan
+
+
+def _find_indent_issues(data: bytes) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int]]]:
+    """查找YAML缩进问题，返回([(行号, Tab列号)], [(行号, 缩进宽度)])，均按行号排序"""
+    kernel = _get_indent_kernel() if len(data) >= _INDENT_KERNEL_MIN_BYTES else None
+    if kernel is not None:
+        tab_lines, tab_cols, odd_lines, odd_widths = kernel(data)
+        return (list(zip(tab_lines.tolist(), tab_cols.tolist())),
+                list(zip(odd_lines.tolist(), odd_widths.tolist())))
+    
+    tab_hits = []
+    odd_hits = []
+    for line_no, match in _iter_line_matches(_INDENT_ISSUE_RE, data):
+        indent = match.group(1)
+        tab_pos = indent.find(b'\t')
+        if tab_pos >= 0:
+            tab_hits.append((line_no, tab_pos + 1))
+        # 缩进的注释行只检查Tab，不计入奇数缩进
+        if len(indent) % 2 == 1 and data[match.end()] != 0x23:  # '#'
+            odd_hits.append((line_no, len(indent)))
+    return tab_hits, odd_hits
+
+
+def _file_key(file_path: Path) -> Tuple[str, int, int]:
+    """文件缓存键：(路径, 修改时间, 大小)，文件被改动后自动失效"""
+    stat = file_path.stat()
+    return os.fspath(file_path), stat.st_mtime_ns, stat.st_size
+
+
+@lru_cache(maxsize=64)
+def _read_bytes_cached(path: str, mtime_ns: int, size: int) -> bytes:
+    """读取文件内容（按_file_key缓存）"""
+    # 无缓冲读取：一次readall即可拿到全部内容，省去BufferedReader的构造开销
+    with open(path, 'rb', buffering=0) as f:
+        return f.read()
+
+
+@lru_cache(maxsize=64)
+def _parse_cached(path: str, mtime_ns: int, size: int) -> Any:
+    """解析JSON/YAML文件（按_file_key缓存，同一文件被多个组合引用时只解析一次）"""
+    data = _read_bytes_cached(path, mtime_ns, size)
+    if path.endswith('.json'):
+        return _json_loads(data)
+    return yaml.load(data, Loader=_SafeLoader)
 
 
 @dataclass
 class FileError:
     """文件错误信息"""
+    __slots__ = ('file_name', 'line_number', 'char_position', 'description')
+    
     file_name: str
     line_number: int
     char_position: int
@@ -33,6 +351,8 @@ class FileError:
 @dataclass
 class SecretKeyError:
     """Secret Key错误信息"""
+    __slots__ = ('file_name', 'line_number', 'char_position', 'secret_name', 'secret_key', 'description')
+    
     file_name: str
     line_number: int
     char_position: int
@@ -47,6 +367,8 @@ class SecretKeyError:
 @dataclass
 class ReviewResult:
     """检查结果数据类"""
+    __slots__ = ('file_errors', 'secret_key_errors', 'placeholder_count', 'secret_ref_match', 'secret_ref_names')
+    
     file_errors: List[FileError]
     secret_key_errors: List[SecretKeyError]
     placeholder_count: int
@@ -65,7 +387,18 @@ class ReviewResult:
 class ENAASReviewerV2:
     """ENAAS配置文件Review工具主类"""
     
-    def __init__(self, enaas_file: str, secret_file: str, dc_file: Optional[str] = None):
+    def __init__(self, enaas_file: str, secret_file: str, dc_file: Optional[str] = None,
+                 buffered: bool = False, verbose: bool = True, scan_cache: bool = True):
+        # buffered为True时检查过程的输出先写入self._out，由调用方一次性取走（批量模式）
+        self._buffered = buffered
+        # verbose为False时省略逐项检查过程和扫描明细，只输出检查结果和汇总
+        self._verbose = verbose
+        # scan_cache为False（或设置了ENAAS_REVIEWER_NO_SCAN_CACHE）时目录扫描不读写磁盘缓存
+        self._scan_cache = scan_cache and not os.environ.get(_SCAN_CACHE_DISABLE_ENV)
+        self.reset(enaas_file, secret_file, dc_file)
+
+    def reset(self, enaas_file: str, secret_file: str, dc_file: Optional[str] = None):
+        """切换到新的文件组合并清空上一次的检查状态，使同一实例可以连续检查多个组合"""
         self.enaas_file = Path(enaas_file)
         self.secret_file = Path(secret_file)
         self.dc_file = Path(dc_file) if dc_file else None
@@ -75,6 +408,25 @@ class ENAASReviewerV2:
         self.secret_data: Optional[Dict] = None
         self.dc_data: Optional[Dict] = None
         
+        # 文件缓存键与解码后的文本，保证每个文件只stat、读取、解码一次
+        self._file_keys: Dict[Path, Tuple[str, int, int]] = {}
+        self._file_text: Dict[Path, str] = {}
+        # 每个文件的行起始偏移表，见_get_line_starts
+        self._line_starts: Dict[Path, List[int]] = {}
+        # secret文件中的placeholder及位置 (内容, 字符偏移)，每次review只扫描一次
+        self._placeholders: Optional[List[Tuple[str, int]]] = None
+        # 提取placeholder时确认的"每行标签都成对"，为True时可跳过标签完整性检查
+        self._placeholder_tags_paired = False
+        # enaas.json中keys的索引 {AppCode: {secret名: key集合}} 和所有合法placeholder，见_build_placeholder_index
+        self._keys_index: Dict[str, Dict[str, Any]] = {}
+        self._valid_placeholders: FrozenSet[str] = frozenset()
+        
+        # 检查过程输出缓冲区（仅buffered模式使用）
+        self._out = io.StringIO()
+        # 当前检查步骤的标题及是否已输出，见_begin_section/_report
+        self._section_title = ""
+        self._section_shown = True
+        
         # 检查结果
         self.result = ReviewResult(
             file_errors=[],
@@ -87,21 +439,23 @@ class ENAASReviewerV2:
         # 验证文件命名规范
         self._validate_file_naming_convention()
 
-    def _scan_openshift_directories(self, target_directory: Optional[str] = None) -> List[Tuple[Path, Path, Optional[Path]]]:
+    def _scan_openshift_directories(self, target_directory: Optional[str] = None,
+                                    max_depth: int = _MAX_SCAN_DEPTH) -> List[Tuple[Path, Path, Optional[Path]]]:
         """通用递归扫描，找到所有需要检查的文件组合"""
         current_dir = Path.cwd()
+        cwd_str = os.fspath(current_dir)
         
         if target_directory:
             # 指定目录扫描模式：从根目录开始寻找目标目录
             print(f"🔍 从根目录开始寻找目录: {target_directory}")
-            target_path = self._find_directory_recursively(current_dir, target_directory)
+            target_path = self._find_directory_recursively(current_dir, target_directory, max_depth=max_depth)
             
             if not target_path:
                 print(f"❌ 在根目录下未找到名为 '{target_directory}' 的目录")
                 print("💡 提示：请检查目录名称是否正确，或使用 'review openshift manifest' 查看所有可用目录")
                 return []
             
-            print(f"🎯 找到目标目录: {target_path.relative_to(current_dir)}")
+            print(f"🎯 找到目标目录: {os.path.relpath(target_path, cwd_str)}")
             print(f"🔍 开始扫描该目录下的所有内容...")
             scan_root = target_path
         else:
@@ -110,78 +464,42 @@ class ENAASReviewerV2:
             scan_root = current_dir
         
         file_combinations = []
-        scanned_dirs = set()  # 避免重复扫描
+        scan_root_str = os.fspath(scan_root)
+        # 扫描产出的路径都以"根目录/"开头，截掉这段前缀即为相对路径
+        prefix_len = len(os.path.join(scan_root_str, ''))
         
-        def scan_directory_recursive(directory: Path, depth: int = 0) -> None:
-            """递归扫描目录，查找配置文件组合"""
-            if depth > 10:  # 防止无限递归
-                return
-                
-            if directory in scanned_dirs:
-                return
-                
-            scanned_dirs.add(directory)
-            
-            # 检查当前目录是否包含配置文件
-            enaas_files = list(directory.glob('*.json'))
-            secret_files = list(directory.glob('*_secret.yml')) + list(directory.glob('*_secret.yaml'))
-            dc_files = list(directory.glob('*_dc.yml')) + list(directory.glob('*_dc.yaml'))
-            
-            # 查找enaas文件
-            enaas_file = None
-            for file in enaas_files:
-                if 'enaas' in file.name.lower():
-                    enaas_file = file
-                    break
+        for dir_path, enaas_name, secret_name, dc_name in self._find_config_dirs(scan_root_str, max_depth):
+            # 显示相对路径（相对于扫描根目录），直接切片字符串，无需构造Path或relpath
+            relative_path = dir_path[prefix_len:]
+            if not relative_path:
+                display_path = scan_root.name if target_directory else "当前目录"
+            else:
+                display_path = f"{scan_root.name}/{relative_path}" if target_directory else relative_path
             
-            # 如果找到enaas文件，检查当前目录的完整性
-            if enaas_file:
-                # 显示相对路径（相对于扫描根目录）
-                relative_path = directory.relative_to(scan_root)
-                if relative_path == Path('.'):
-                    display_path = scan_root.name if target_directory else "当前目录"
+            # 检查是否找到必要的文件
+            if secret_name:
+                self._log(f"\n📁 发现配置目录: {display_path}")
+                self._log(f"   ✅ 找到文件组合:")
+                self._log(f"      - ENAAS: {enaas_name}")
+                self._log(f"      - Secret: {secret_name}")
+                if dc_name:
+                    self._log(f"      - DC: {dc_name}")
                 else:
-                    display_path = f"{scan_root.name}/{relative_path}" if target_directory else str(relative_path)
-                
-                print(f"\n📁 发现配置目录: {display_path}")
+                    self._log(f"      - DC: 未找到")
                 
-                # 查找secret文件
-                secret_file = None
-                if secret_files:
-                    secret_file = secret_files[0]  # 取第一个找到的
-                
-                # 查找dc文件
-                dc_file = None
-                if dc_files:
-                    dc_file = dc_files[0]  # 取第一个找到的
-                
-                # 检查是否找到必要的文件
-                if secret_file:
-                    print(f"   ✅ 找到文件组合:")
-                    print(f"      - ENAAS: {enaas_file.name}")
-                    print(f"      - Secret: {secret_file.name}")
-                    if dc_file:
-                        print(f"      - DC: {dc_file.name}")
-                    else:
-                        print(f"      - DC: 未找到")
-                    
-                    file_combinations.append((enaas_file, secret_file, dc_file))
-                else:
-                    print(f"   ⚠️  缺少secret文件")
-                    print(f"      - ENAAS: {enaas_file.name}")
-                    print(f"      - 需要: *_secret.yml 或 *_secret.yaml")
-            
-            # 递归扫描子目录
-            try:
-                for item in directory.iterdir():
-                    if item.is_dir() and not item.name.startswith('.'):
-                        scan_directory_recursive(item, depth + 1)
-            except PermissionError:
-                # 跳过无权限的目录
-                pass
-        
-        # 开始递归扫描
-        scan_directory_recursive(scan_root)
+                # 只在确认是有效组合时才构造Path对象
+                directory = Path(dir_path)
+                file_combinations.append((
+                    directory / enaas_name,
+                    directory / secret_name,
+                    directory / dc_name if dc_name else None
+                ))
+            else:
+                # 缺少secret文件的目录不会被检查，quiet模式下也要提示
+                self._emit(f"\n📁 发现配置目录: {display_path}")
+                self._emit(f"   ⚠️  缺少secret文件")
+                self._emit(f"      - ENAAS: {enaas_name}")
+                self._emit(f"      - 需要: *_secret.yml 或 *_secret.yaml")
         
         if not file_combinations:
             if target_directory:
@@ -200,29 +518,93 @@ class ENAASReviewerV2:
         
         return file_combinations
     
-    def _find_directory_recursively(self, root_dir: Path, target_name: str, depth: int = 0) -> Optional[Path]:
-        """递归查找指定名称的目录"""
-        if depth > 10:  # 防止无限递归
-            return None
+    def _find_config_dirs(self, scan_root: str, max_depth: int) -> List[Tuple[str, str, Optional[str], Optional[str]]]:
+        """查找所有包含enaas文件的目录；目录树自上次扫描后没有变化时直接使用磁盘缓存"""
+        if not self._scan_cache:
+            return list(self._scandir_recursive(scan_root, max_depth, {}))
+        
+        cache = _load_scan_cache()
+        roots = cache.setdefault('roots', {})
+        cache_key = f"{scan_root}|{max_depth}"
         
-        # 检查当前目录
+        cached = roots.get(cache_key)
+        if cached and _dirs_unchanged(cached['dirs']):
+            return [tuple(hit) for hit in cached['hits']]
+        
+        started_ns = time.time_ns()
+        dir_mtimes: Dict[str, Optional[int]] = {}
+        hits = list(self._scandir_recursive(scan_root, max_depth, dir_mtimes))
+        
+        # 有无权限的目录、或目录刚被修改过时不写缓存，避免之后误判为未变化
+        mtimes = dir_mtimes.values()
+        if all(mtime_ns is not None and mtime_ns < started_ns - _SCAN_CACHE_RACY_NS for mtime_ns in mtimes):
+            roots.pop(cache_key, None)
+            roots[cache_key] = {'dirs': dir_mtimes, 'hits': hits}
+            # 只保留最近使用的若干个扫描根目录
+            for stale_key in list(roots)[:-_SCAN_CACHE_MAX_ROOTS]:
+                del roots[stale_key]
+            _save_scan_cache(cache)
+        return hits
+    
+    def _scandir_recursive(self, scan_root: str, max_depth: int,
+                           dir_mtimes: Dict[str, Optional[int]]) -> Iterator[Tuple[str, str, Optional[str], Optional[str]]]:
+        """广度优先遍历目录树，对每个包含enaas文件的目录产出(目录路径, enaas文件名, secret文件名, dc文件名)，
+        同时把访问过的目录及其修改时间记入dir_mtimes（无权限的目录记为None）"""
+        # scandir/stat期间会释放GIL，同一层的目录交给线程池并发扫描；
+        # executor.map按提交顺序返回结果，产出顺序与串行遍历一致
+        level = [scan_root]
+        depth = 0
+        with ThreadPoolExecutor(max_workers=_SCAN_WORKERS) as executor:
+            while level:
+                next_level = []
+                for dir_path, entries in zip(level, executor.map(_scan_dir_entries, level)):
+                    if entries is None:
+                        dir_mtimes[dir_path] = None
+                        continue
+                    dir_mtimes[dir_path], subdirs, enaas_name, secret_name, dc_name = entries
+                    # 超过最大深度的子目录不再入队
+                    if depth < max_depth:
+                        next_level.extend(subdirs)
+                    if enaas_name:
+                        yield dir_path, enaas_name, secret_name, dc_name
+                level = next_level
+                depth += 1
+    
+    def _find_directory_recursively(self, root_dir: Path, target_name: str,
+                                    max_depth: int = _MAX_SCAN_DEPTH) -> Optional[Path]:
+        """深度优先查找指定名称的目录（显式栈迭代，返回先序遍历中的第一个匹配）"""
         if root_dir.name == target_name:
             return root_dir
         
-        # 递归搜索子目录
-        try:
-            for item in root_dir.iterdir():
-                if item.is_dir() and not item.name.startswith('.'):
-                    result = self._find_directory_recursively(item, target_name, depth + 1)
-                    if result:
-                        return result
-        except PermissionError:
-            # 跳过无权限的目录
-            pass
+        # 栈元素: (目录路径, 深度)；子目录逆序入栈以保持先序遍历顺序
+        stack = [(os.fspath(root_dir), 0)]
+        while stack:
+            dir_path, depth = stack.pop()
+            if depth and os.path.basename(dir_path) == target_name:
+                return Path(dir_path)
+            
+            # 超过最大深度的子目录不再入栈
+            if depth >= max_depth:
+                continue
+            
+            # 无关目录不深入，除非它本身就是要找的目录
+            try:
+                with os.scandir(dir_path) as entries:
+                    subdirs = [
+                        entry.path for entry in entries
+                        if entry.is_dir(follow_symlinks=False) and not entry.name.startswith('.')
+                        and (entry.name not in _SKIP_DIRS or entry.name == target_name)
+                    ]
+            except PermissionError:
+                # 跳过无权限的目录
+                continue
+            
+            stack.extend((subdir, depth + 1) for subdir in reversed(subdirs))
         
         return None
 
-    def run_batch_review(self, target_directory: Optional[str] = None) -> List[ReviewResult]:
+    def run_batch_review(self, target_directory: Optional[str] = None,
+                         max_depth: int = _MAX_SCAN_DEPTH) -> List[ReviewResult]:
         """批量检查所有找到的文件组合"""
         if target_directory:
             print(f"🚀 开始批量检查指定目录: {target_directory}")
@@ -230,24 +612,36 @@ class ENAASReviewerV2:
             print("🚀 开始批量检查所有openshift配置...")
         print("=" * 80)
         
-        file_combinations = self._scan_openshift_directories(target_directory)
+        file_combinations = self._scan_openshift_directories(target_directory, max_depth)
         if not file_combinations:
             print("❌ 没有找到需要检查的文件组合")
             return []
         
         results = []
         total_combinations = len(file_combinations)
+        cwd_str = os.getcwd()
         
-        for i, (enaas_file, secret_file, dc_file) in enumerate(file_combinations, 1):
+        # 各组合之间相互独立，多个组合时分发到进程池并行检查；map保证结果按原顺序返回
+        enaas_paths = [str(enaas_file) for enaas_file, _, _ in file_combinations]
+        secret_paths = [str(secret_file) for _, secret_file, _ in file_combinations]
+        dc_paths = [str(dc_file) if dc_file else None for _, _, dc_file in file_combinations]
+        verbose_flags = [self._verbose] * total_combinations
+        if total_combinations < 2:
+            outcomes = list(map(_review_one, enaas_paths, secret_paths, dc_paths, verbose_flags))
+        else:
+            # 进程数不超过组合数；组合较多时按块分发，减少进程间通信往返
+            workers = min(total_combinations, os.cpu_count() or 1)
+            chunksize = max(1, total_combinations // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                outcomes = list(executor.map(_review_one, enaas_paths, secret_paths, dc_paths, verbose_flags,
+                                             chunksize=chunksize))
+        
+        for i, ((enaas_file, _, _), (result, output, error)) in enumerate(zip(file_combinations, outcomes), 1):
             print(f"\n{'='*20} 检查组合 {i}/{total_combinations} {'='*20}")
-            print(f"📍 位置: {enaas_file.parent.relative_to(Path.cwd())}")
-            
-            # 创建新的reviewer实例
-            reviewer = ENAASReviewerV2(str(enaas_file), str(secret_file), str(dc_file) if dc_file else None)
+            print(f"📍 位置: {os.path.relpath(enaas_file.parent, cwd_str)}")
+            sys.stdout.write(output)
             
-            # 运行检查
-            try:
-                result = reviewer.run_review()
+            if result is not None:
                 results.append(result)
                 
                 # 显示简要结果
@@ -256,15 +650,15 @@ class ENAASReviewerV2:
                 else:
                     print(f"✅ 组合 {i} 检查通过")
                     
-            except Exception as e:
-                print(f"❌ 组合 {i} 检查失败: {e}")
+            else:
+                print(f"❌ 组合 {i} 检查失败: {error}")
                 # 创建错误结果
                 error_result = ReviewResult(
                     file_errors=[FileError(
                         file_name=f"组合{i}",
                         line_number=0,
                         char_position=0,
-                        description=f"检查失败: {e}"
+                        description=f"检查失败: {error}"
                     )],
                     secret_key_errors=[],
                     placeholder_count=0,
@@ -312,7 +706,7 @@ class ENAASReviewerV2:
             ))
         
         # 检查secret文件命名规范
-        if not self.secret_file.name.endswith('_secret.yml') and not self.secret_file.name.endswith('_secret.yaml'):
+        if not self.secret_file.name.endswith(_SECRET_SUFFIXES):
             self.result.file_errors.append(FileError(
                 file_name=self.secret_file.name,
                 line_number=0,
@@ -322,7 +716,7 @@ class ENAASReviewerV2:
         
         # 检查dc文件命名规范（如果提供）
         if self.dc_file:
-            if not self.dc_file.name.endswith('_dc.yml') and not self.dc_file.name.endswith('_dc.yaml'):
+            if not self.dc_file.name.endswith(_DC_SUFFIXES):
                 self.result.file_errors.append(FileError(
                     file_name=self.dc_file.name,
                     line_number=0,
@@ -331,8 +725,8 @@ class ENAASReviewerV2:
                 ))
             
             # 检查secret和dc文件的基础名称是否一致
-            secret_base = self.secret_file.name.replace('_secret.yml', '').replace('_secret.yaml', '')
-            dc_base = self.dc_file.name.replace('_dc.yml', '').replace('_dc.yaml', '')
+            secret_base = _strip_suffix(self.secret_file.name, _SECRET_SUFFIXES)
+            dc_base = _strip_suffix(self.dc_file.name, _DC_SUFFIXES)
             
             if secret_base != dc_base:
                 self.result.file_errors.append(FileError(
@@ -342,13 +736,38 @@ class ENAASReviewerV2:
                     description=f"dc文件基础名称({dc_base})与secret文件基础名称({secret_base})不匹配"
                 ))
 
+    def _log(self, message: str = "", end: str = "\n"):
+        """输出检查过程信息（非verbose模式下省略）；发现的问题和被跳过的检查用_report输出"""
+        if self._verbose:
+            self._emit(message, end)
+
+    def _begin_section(self, title: str):
+        """开始一个检查步骤：verbose模式下立即输出标题，否则等到该步骤第一次_report时再补上"""
+        self._section_title = title
+        self._section_shown = self._verbose
+        self._log(title)
+
+    def _report(self, message: str):
+        """输出检查中发现的问题或被跳过的检查（始终输出，quiet模式下先补上所在步骤的标题）"""
+        if not self._section_shown:
+            self._emit(self._section_title)
+            self._section_shown = True
+        self._emit(message)
+
+    def _emit(self, message: str = "", end: str = "\n"):
+        """输出信息（检查结果等始终输出）"""
+        if self._buffered:
+            self._out.write(message + end)
+        else:
+            print(message, end=end)
+
     def run_review(self) -> ReviewResult:
         """运行完整的review流程"""
-        print("开始ENAAS配置文件Review v2...")
-        print(f"检查文件: {self.enaas_file} 和 {self.secret_file}")
+        self._log("开始ENAAS配置文件Review v2...")
+        self._log(f"检查文件: {self.enaas_file} 和 {self.secret_file}")
         if self.dc_file:
-            print(f"包含dc文件: {self.dc_file}")
-        print("-" * 60)
+            self._log(f"包含dc文件: {self.dc_file}")
+        self._log("-" * 60)
 
         # 1. 检查各文件合法性（格式、结构、缩进）
         self._check_files_validity()
@@ -369,38 +788,48 @@ class ENAASReviewerV2:
 
     def _check_files_validity(self):
         """1. 检查各文件合法性（格式、结构、缩进）"""
-        print("1. 各文件合法性检查")
-        print("   检查文件:", end=" ")
+        self._log("1. 各文件合法性检查")
+        self._log("   检查文件:", end=" ")
         
         files_to_check = [self.enaas_file, self.secret_file]
         if self.dc_file:
             files_to_check.append(self.dc_file)
         
         file_names = [f.name for f in files_to_check]
-        print(", ".join(file_names))
+        self._log(", ".join(file_names))
         
         for file_path in files_to_check:
             self._validate_single_file(file_path)
         
         if self.result.file_errors:
-            print("   ❌ 发现问题:")
+            self._log("   ❌ 发现问题:")
             for error in self.result.file_errors:
-                print(f"     - {error}")
+                self._log(f"     - {error}")
         else:
-            print("   ✅ 所有文件格式、结构、缩进都正确")
+            self._log("   ✅ 所有文件格式、结构、缩进都正确")
 
     def _validate_single_file(self, file_path: Path):
         """验证单个文件的合法性"""
         try:
+            # 只读取一次文件字节，后续各项检查共用；文件不存在时由读取直接抛出，无需事先检查
+            data = self._load_bytes(file_path)
+            
             # 检查文件基本属性
-            self._validate_file_basics(file_path)
+            self._validate_file_basics(file_path, data)
             
             # 根据文件类型进行特定检查
             if file_path.suffix == '.json':
-                self._validate_json_file(file_path)
+                self._validate_json_file(file_path, data)
             elif file_path.suffix in ['.yml', '.yaml']:
-                self._validate_yaml_file(file_path)
+                self._validate_yaml_file(file_path, data)
                 
+        except FileNotFoundError:
+            self.result.file_errors.append(FileError(
+                file_name=file_path.name,
+                line_number=0,
+                char_position=0,
+                description="文件加载失败: 文件不存在"
+            ))
         except Exception as e:
             self.result.file_errors.append(FileError(
                 file_name=file_path.name,
@@ -409,14 +838,10 @@ class ENAASReviewerV2:
                 description=f"文件加载失败: {e}"
             ))
 
-    def _validate_file_basics(self, file_path: Path):
+    def _validate_file_basics(self, file_path: Path, data: bytes):
         """验证文件基本属性"""
-        if not file_path.exists():
-            raise FileNotFoundError(f"文件不存在")
-            
-        # 检查文件大小
-        file_size = file_path.stat().st_size
-        if file_size == 0:
+        # 检查文件大小（直接用已读取的内容长度，无需再stat）
+        if not data:
             self.result.file_errors.append(FileError(
                 file_name=file_path.name,
                 line_number=0,
@@ -424,14 +849,13 @@ class ENAASReviewerV2:
                 description="文件为空"
             ))
 
-    def _validate_json_file(self, file_path: Path):
+    def _validate_json_file(self, file_path: Path, data: bytes):
         """验证JSON文件"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                self.enaas_data = json.loads(content)
+            self.enaas_data = self._parse_file(file_path)
         except json.JSONDecodeError as e:
-            # 计算错误位置
+            # orjson.JSONDecodeError是json.JSONDecodeError的子类；仅在出错时解码文本用于计算错误位置
+            content = data.decode('utf-8', errors='replace')
             line_no, char_pos = self._calculate_json_error_position(content, e.pos)
             self.result.file_errors.append(FileError(
                 file_name=file_path.name,
@@ -440,18 +864,20 @@ class ENAASReviewerV2:
                 description=f"JSON格式错误: {e.msg}"
             ))
 
-    def _validate_yaml_file(self, file_path: Path):
+    def _validate_yaml_file(self, file_path: Path, data: bytes):
         """验证YAML文件"""
         try:
-            # 检查YAML缩进
-            self._validate_yaml_indentation(file_path)
+            # 检查YAML缩进（直接在字节上进行，无需解码）
+            self._validate_yaml_indentation(file_path, data)
+            
+            # 解码一次并缓存，后续placeholder检查直接复用
+            self._read_file_content(file_path)
             
             # 解析YAML
-            with open(file_path, 'r', encoding='utf-8') as f:
-                if file_path == self.secret_file:
-                    self.secret_data = yaml.safe_load(f)
-                elif file_path == self.dc_file:
-                    self.dc_data = yaml.safe_load(f)
+            if file_path == self.secret_file:
+                self.secret_data = self._parse_file(file_path)
+            elif file_path == self.dc_file:
+                self.dc_data = self._parse_file(file_path)
                     
         except yaml.YAMLError as e:
             # 计算错误位置
@@ -468,10 +894,7 @@ class ENAASReviewerV2:
         if pos >= len(content):
             return 1, 1
             
-        lines = content[:pos].split('\n')
-        line_no = len(lines)
-        char_pos = len(lines[-1]) + 1
-        return line_no, char_pos
+        return _offset_to_line_col(_build_line_starts(content), pos)
 
     def _calculate_yaml_error_position(self, file_path: Path, error: yaml.YAMLError) -> Tuple[int, int]:
         """计算YAML错误位置"""
@@ -483,95 +906,135 @@ class ENAASReviewerV2:
             pass
         return 1, 1
 
-    def _validate_yaml_indentation(self, file_path: Path):
-        """验证YAML文件缩进"""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-                
-            for line_num, line in enumerate(lines, 1):
-                if line.strip() and not line.startswith('#'):
-                    # 检查缩进是否使用空格（不是tab）
-                    if '\t' in line:
-                        tab_pos = line.find('\t')
-                        self.result.file_errors.append(FileError(
-                            file_name=file_path.name,
-                            line_number=line_num,
-                            char_position=tab_pos + 1,
-                            description="使用了Tab缩进，应该使用空格"
-                        ))
-                    
-                    # 检查缩进是否一致（2的倍数）
-                    indent = len(line) - len(line.lstrip())
-                    if indent % 2 != 0 and indent > 0:
-                        self.result.file_errors.append(FileError(
-                            file_name=file_path.name,
-                            line_number=line_num,
-                            char_position=indent + 1,
-                            description=f"缩进不是2的倍数 ({indent} 空格)"
-                        ))
-                        
-        except Exception as e:
-            self.result.file_errors.append(FileError(
+    def _validate_yaml_indentation(self, file_path: Path, data: bytes):
+        """验证YAML文件缩进（只定位有问题的行，不逐行循环）"""
+        tab_hits, odd_hits = _find_indent_issues(data)
+        
+        # (行号, 检查顺序, 错误)，最后按行号排序，同一行Tab错误在前
+        errors: List[Tuple[int, int, FileError]] = []
+        
+        # 检查缩进是否使用空格（不是tab）
+        for line_no, char_pos in tab_hits:
+            errors.append((line_no, 0, FileError(
                 file_name=file_path.name,
-                line_number=0,
-                char_position=0,
-                description=f"无法检查缩进: {e}"
-            ))
+                line_number=line_no,
+                char_position=char_pos,
+                description="使用了Tab缩进，应该使用空格"
+            )))
+        
+        # 检查缩进是否一致（2的倍数）
+        for line_no, indent in odd_hits:
+            errors.append((line_no, 1, FileError(
+                file_name=file_path.name,
+                line_number=line_no,
+                char_position=indent + 1,
+                description=f"缩进不是2的倍数 ({indent} 空格)"
+            )))
+        
+        errors.sort(key=lambda item: item[:2])
+        self.result.file_errors.extend(error for _, _, error in errors)
 
     def _check_secret_manifest_validity(self):
         """2. 检查Secret Manifest合法性（placeholder）"""
-        print("\n2. Secret Manifest合法性检查")
+        self._begin_section("\n2. Secret Manifest合法性检查")
         
         if not self.secret_data:
-            print("   ❌ 无法检查：secret.yml文件加载失败")
+            self._report("   ❌ 无法检查：secret.yml文件加载失败")
             return
             
         try:
             secret_content = self._read_file_content(self.secret_file)
-            placeholders = self._extract_placeholders(secret_content)
+            placeholders = self._get_placeholders()
             self.result.placeholder_count = len(placeholders)
             
-            print(f"   检查了 {len(placeholders)} 个placeholder")
+            self._log(f"   检查了 {len(placeholders)} 个placeholder")
             
-            # 检查placeholder标签完整性
-            self._check_placeholder_tags(placeholders, secret_content)
+            # 检查placeholder标签完整性（提取时已确认每行成对则无需逐个定位标签）
+            if not self._placeholder_tags_paired:
+                self._check_placeholder_tags(secret_content, self._get_line_starts(self.secret_file))
             
             if not self.result.secret_key_errors:
-                print("   ✅ 所有placeholder标签格式正确")
+                self._log("   ✅ 所有placeholder标签格式正确")
                 
         except Exception as e:
-            print(f"   ❌ 检查失败: {e}")
-
-    def _extract_placeholders(self, content: str) -> List[str]:
-        """提取所有placeholder内容"""
-        placeholder_pattern = r'<ENAAS_PLACEHOLDER>(.*?)<ENAAS_PLACEHOLDER>'
-        return re.findall(placeholder_pattern, content)
-
-    def _check_placeholder_tags(self, placeholders: List[str], content: str):
-        """检查placeholder标签完整性"""
-        lines = content.split('\n')
-        
-        for line_num, line in enumerate(lines, 1):
-            tags_in_line = line.count('<ENAAS_PLACEHOLDER>')
-            if tags_in_line > 0 and tags_in_line % 2 != 0:
-                # 找到第一个标签位置
-                tag_pos = line.find('<ENAAS_PLACEHOLDER>')
-                self.result.secret_key_errors.append(SecretKeyError(
-                    file_name=self.secret_file.name,
-                    line_number=line_num,
-                    char_position=tag_pos + 1,
-                    secret_name="",
-                    secret_key="",
-                    description="ENAAS_PLACEHOLDER标签不成对"
-                ))
+            self._report(f"   ❌ 检查失败: {e}")
+
+    def _get_placeholders(self) -> List[Tuple[str, int]]:
+        """获取secret文件中的所有placeholder及其字符偏移（带缓存）"""
+        if self._placeholders is None:
+            self._placeholders, self._placeholder_tags_paired = self._scan_placeholders(
+                self._read_file_content(self.secret_file)
+            )
+        return self._placeholders
+
+    def _get_line_starts(self, file_path: Path) -> List[int]:
+        """获取文件每行的起始偏移（带缓存）"""
+        line_starts = self._line_starts.get(file_path)
+        if line_starts is None:
+            line_starts = _build_line_starts(self._read_file_content(file_path))
+            self._line_starts[file_path] = line_starts
+        return line_starts
+
+    def _scan_placeholders(self, content: str) -> Tuple[List[Tuple[str, int]], bool]:
+        """单次扫描提取所有placeholder内容及其字符偏移（行号、列号只在报错时才换算），
+        同时返回每行标签是否都成对"""
+        # 不含标签的secret（未模板化）直接返回，免去切分时复制整段文本
+        if _PH_TAG not in content:
+            return [], True
+        
+        placeholders = []
+        
+        # 按标签切分后奇数下标即placeholder内容；标签总数为偶数且内容都不跨行时，
+        # 这种两两配对与逐行配对的正则结果完全一致，可以免去正则回溯
+        parts = content.split(_PH_TAG)
+        if len(parts) % 2 == 1 and not any('\n' in body for body in parts[1::2]):
+            tag_len = len(_PH_TAG)
+            offset = len(parts[0])
+            for i in range(1, len(parts), 2):
+                body_start = offset + tag_len
+                placeholders.append((parts[i], body_start))
+                offset = body_start + len(parts[i]) + tag_len + len(parts[i + 1])
+            return placeholders, True
+        
+        # 存在不成对的标签，回退到正则逐行配对
+        for match in _PH_RE.finditer(content):
+            placeholders.append((match.group(1), match.start(1)))
+        return placeholders, False
+
+    def _check_placeholder_tags(self, content: str, line_starts: List[int]):
+        """检查placeholder标签完整性（每行的标签数必须成对）"""
+        # 标签是固定字符串，用str.find逐个定位即可，按所在行分组计数并记录每行第一个标签的偏移
+        tag_counts: Dict[int, int] = {}
+        first_tag_offsets: Dict[int, int] = {}
+        tag_len = len(_PH_TAG)
+        pos = content.find(_PH_TAG)
+        while pos != -1:
+            line_num = bisect_right(line_starts, pos)
+            if line_num in tag_counts:
+                tag_counts[line_num] += 1
+            else:
+                tag_counts[line_num] = 1
+                first_tag_offsets[line_num] = pos
+            pos = content.find(_PH_TAG, pos + tag_len)
+        
+        self.result.secret_key_errors.extend(
+            SecretKeyError(
+                file_name=self.secret_file.name,
+                line_number=line_num,
+                char_position=_offset_to_line_col(line_starts, first_tag_offsets[line_num])[1],
+                secret_name="",
+                secret_key="",
+                description="ENAAS_PLACEHOLDER标签不成对"
+            )
+            for line_num, tags_in_line in tag_counts.items() if tags_in_line % 2 != 0
+        )
 
     def _check_secret_matching(self):
         """3. 检查secret匹配"""
-        print("\n3. Secret匹配检查")
+        self._begin_section("\n3. Secret匹配检查")
         
         if not self.enaas_data or not self.secret_data:
-            print("   ❌ 无法检查：必要文件加载失败")
+            self._report("   ❌ 无法检查：必要文件加载失败")
             return
             
         try:
@@ -586,68 +1049,79 @@ class ENAASReviewerV2:
             self._check_placeholder_content_matching()
             
             if not self.result.secret_key_errors:
-                print("   ✅ 所有secret配置都匹配")
+                self._log("   ✅ 所有secret配置都匹配")
                 
         except Exception as e:
-            print(f"   ❌ 检查失败: {e}")
+            self._report(f"   ❌ 检查失败: {e}")
 
     def _validate_enaas_structure(self) -> bool:
         """验证enaas.json结构"""
-        required_keys = ['keys', 'autoKeys', 'encodedKeys']
-        for key in required_keys:
-            if key not in self.enaas_data:
-                print(f"   ❌ enaas.json缺少必需的键: {key}")
+        # 常见情况下必需的键都在，一次集合比较即可确认；缺失时按固定顺序列出全部缺失的键
+        if not isinstance(self.enaas_data, dict) or not self.enaas_data.keys() >= _REQUIRED_ENAAS_KEYS:
+            missing = [key for key in _REQUIRED_ENAAS_KEY_ORDER if key not in self.enaas_data]
+            if missing:
+                self._report(f"   ❌ enaas.json缺少必需的键: {', '.join(missing)}")
                 return False
 
         # 检查是否有至少一个AppCode配置
         if not self.enaas_data['keys']:
-            print("   ❌ enaas.json中缺少AppCode配置")
+            self._report("   ❌ enaas.json中缺少AppCode配置")
             return False
             
-        # 显示找到的AppCode
-        app_codes = list(self.enaas_data['keys'].keys())
-        print(f"   ✅ enaas.json结构完整，找到AppCode: {', '.join(app_codes)}")
+        # 必需的键确认无误后展开合法placeholder索引，供后续匹配检查使用；
+        # 个别secret的key列表格式不对时只报告该项，其余检查照常进行
+        if self._build_placeholder_index():
+            # 显示找到的AppCode
+            app_codes = list(self.enaas_data['keys'].keys())
+            self._log(f"   ✅ enaas.json结构完整，找到AppCode: {', '.join(app_codes)}")
         return True
 
     def _check_encoded_keys_consistency(self):
         """检查encodedKeys与keys的一致性"""
-        keys_data = self.enaas_data.get('keys', {})
         encoded_keys_data = self.enaas_data.get('encodedKeys', {})
         
         checked_keys = 0
         for app_name, secret_configs in encoded_keys_data.items():
-            if app_name not in keys_data:
-                print(f"   ❌ encodedKeys中的应用 {app_name} 在keys中不存在")
+            app_keys = self._keys_index.get(app_name)
+            if app_keys is None:
+                self._report(f"   ❌ encodedKeys中的应用 {app_name} 在keys中不存在")
                 continue
                 
             for secret_name, encoded_key_list in secret_configs.items():
-                if secret_name not in keys_data[app_name]:
-                    print(f"   ❌ encodedKeys中的secret {secret_name} 在keys中不存在")
+                key_names = app_keys.get(secret_name)
+                if key_names is None:
+                    self._report(f"   ❌ encodedKeys中的secret {secret_name} 在keys中不存在")
                     continue
                     
+                checked_keys += len(encoded_key_list)
                 for encoded_key in encoded_key_list:
-                    checked_keys += 1
-                    if encoded_key not in keys_data[app_name][secret_name]:
-                        print(f"   ❌ encodedKeys中的key {encoded_key} 在keys.{app_name}.{secret_name}中不存在")
+                    try:
+                        found = encoded_key in key_names
+                    except TypeError:
+                        # encodedKey本身不可哈希（如写成了列表）：集合里只有可哈希的值，不可能相等，按不存在报告
+                        found = False
+                    if not found:
+                        self._report(f"   ❌ encodedKeys中的key {encoded_key} 在keys.{app_name}.{secret_name}中不存在")
                         
-        print(f"   检查了 {checked_keys} 个encodedKeys")
+        self._log(f"   检查了 {checked_keys} 个encodedKeys")
 
     def _check_placeholder_content_matching(self):
-        """检查placeholder内容是否与enaas.json匹配"""
-        if not self.secret_data:
-            return
-            
-        try:
-            secret_content = self._read_file_content(self.secret_file)
-            placeholders = self._extract_placeholders(secret_content)
-            
-            checked_keys = 0
-            for placeholder in placeholders:
-                checked_keys += 1
-                if not self._validate_placeholder_content(placeholder):
-                    # 找到placeholder在文件中的位置
-                    line_num, char_pos = self._find_placeholder_position(placeholder, secret_content)
-                    self.result.secret_key_errors.append(SecretKeyError(
+        """检查placeholder内容是否与enaas.json匹配（由_check_secret_matching调用，文件加载和异常已在那里处理）"""
+        placeholders = self._get_placeholders()
+        
+        # 同一placeholder在文件中常出现多次，先去重再校验，每个只校验一次
+        invalid = {
+            placeholder for placeholder in {placeholder for placeholder, _ in placeholders}
+            if not self._validate_placeholder_content(placeholder)
+        }
+        if invalid:
+            # 只有出错的placeholder才需要换算行号、列号；错误先收集再一次性加入结果
+            line_starts = self._get_line_starts(self.secret_file)
+            errors = []
+            for placeholder, offset in placeholders:
+                if placeholder in invalid:
+                    line_num, char_pos = _offset_to_line_col(line_starts, offset)
+                    errors.append(SecretKeyError(
                         file_name=self.secret_file.name,
                         line_number=line_num,
                         char_position=char_pos,
@@ -655,65 +1129,54 @@ class ENAASReviewerV2:
                         secret_key=placeholder,
                         description="在enaas.json中未找到对应的配置"
                     ))
-                    
-            print(f"   检查了 {checked_keys} 个placeholder内容")
-            
-        except Exception as e:
-            print(f"   ❌ placeholder内容检查失败: {e}")
-
-    def _validate_placeholder_content(self, placeholder: str) -> bool:
-        """验证单个placeholder内容"""
-        # 检查是否为有效的keys placeholder (secretname_keyname)
-        if self._is_valid_keys_placeholder(placeholder):
-            return True
-            
-        # 检查是否为有效的autoKeys placeholder (keyname_value)
-        if self._is_valid_auto_keys_placeholder(placeholder):
-            return True
-            
-        return False
+            self.result.secret_key_errors.extend(errors)
+                
+        self._log(f"   检查了 {len(placeholders)} 个placeholder内容")
 
-    def _is_valid_keys_placeholder(self, placeholder: str) -> bool:
-        """检查是否为有效的keys placeholder"""
-        if '_' not in placeholder:
-            return False
-            
-        secret_name, key_name = placeholder.split('_', 1)
+    def _build_placeholder_index(self) -> bool:
+        """建立keys索引，并将keys/autoKeys展开为合法placeholder集合，之后每次校验只需一次哈希查找；
+        返回keys下每个secret是否都是key列表"""
+        # keys索引：每个secret下的key列表转为集合，encodedKeys检查直接查集合。
+        # 不是列表的项（如写成字符串）不能逐个展开，否则字符串会被拆成单个字符，按结构错误报告并视为空
+        structure_ok = True
+        self._keys_index = {}
+        for app_name, app_config in self.enaas_data.get('keys', {}).items():
+            app_index = {}
+            for secret_name, key_names in app_config.items():
+                if isinstance(key_names, list):
+                    app_index[secret_name] = _as_lookup(key_names)
+                else:
+                    self._report(f"   ❌ keys.{app_name}.{secret_name}应为key列表，实际为{type(key_names).__name__}")
+                    app_index[secret_name] = frozenset()
+                    structure_ok = False
+            self._keys_index[app_name] = app_index
         
-        for app_config in self.enaas_data.get('keys', {}).values():
-            if secret_name in app_config and key_name in app_config[secret_name]:
-                return True
-        return False
-
-    def _is_valid_auto_keys_placeholder(self, placeholder: str) -> bool:
-        """检查是否为有效的autoKeys placeholder"""
+        valid_placeholders = set()
+        # keys placeholder: secretname_keyname
+        for app_config in self._keys_index.values():
+            for secret_name, key_names in app_config.items():
+                valid_placeholders.update(f"{secret_name}_{key_name}" for key_name in key_names)
+        # autoKeys placeholder: keyname_value
         for auto_configs in self.enaas_data.get('autoKeys', {}).values():
             for key_name, value_list in auto_configs.items():
-                for value in value_list:
-                    expected_placeholder = f"{key_name}_{value}"
-                    if placeholder == expected_placeholder:
-                        return True
-        return False
+                valid_placeholders.update(f"{key_name}_{value}" for value in value_list)
+        self._valid_placeholders = frozenset(valid_placeholders)
+        return structure_ok
 
-    def _find_placeholder_position(self, placeholder: str, content: str) -> Tuple[int, int]:
-        """找到placeholder在文件中的位置"""
-        lines = content.split('\n')
-        for line_num, line in enumerate(lines, 1):
-            if placeholder in line:
-                char_pos = line.find(placeholder) + 1
-                return line_num, char_pos
-        return 1, 1
+    def _validate_placeholder_content(self, placeholder: str) -> bool:
+        """验证单个placeholder内容"""
+        return placeholder in self._valid_placeholders
 
     def _check_secret_reference_validity(self):
         """4. 检查secret引用合法性"""
-        print("\n4. Secret引用合法性检查")
+        self._begin_section("\n4. Secret引用合法性检查")
         
         if not self.dc_file:
-            print("   ⚠️  跳过：未提供dc.yml文件")
+            self._report("   ⚠️  跳过：未提供dc.yml文件")
             return
             
         if not self.dc_data or not self.secret_data:
-            print("   ❌ 无法检查：必要文件加载失败")
+            self._report("   ❌ 无法检查：必要文件加载失败")
             return
             
         try:
@@ -723,113 +1186,159 @@ class ENAASReviewerV2:
                 return
                 
             # 查找dc.yml中的secretRef引用
-            secret_refs = self._find_secret_refs(self.dc_data)
+            ref_names = self._find_secret_refs(self.dc_data)
             
-            if not secret_refs:
-                print("   ⚠️  dc.yml中未找到secretRef引用")
+            if not ref_names:
+                self._report("   ⚠️  dc.yml中未找到secretRef引用")
                 return
                 
             # 检查引用是否匹配
-            ref_names = [ref[0] for ref in secret_refs]
             self.result.secret_ref_names = (secret_name, ", ".join(ref_names))
             
             all_match = all(ref_name == secret_name for ref_name in ref_names)
             self.result.secret_ref_match = all_match
             
             if all_match:
-                print(f"   ✅ 引用匹配: secret.yml({secret_name}) = dc.yml({', '.join(ref_names)})")
+                self._log(f"   ✅ 引用匹配: secret.yml({secret_name}) = dc.yml({', '.join(ref_names)})")
             else:
-                print(f"   ❌ 引用不匹配: secret.yml({secret_name}) ≠ dc.yml({', '.join(ref_names)})")
+                self._report(f"   ❌ 引用不匹配: secret.yml({secret_name}) ≠ dc.yml({', '.join(ref_names)})")
                 
         except Exception as e:
-            print(f"   ❌ 检查失败: {e}")
+            self._report(f"   ❌ 检查失败: {e}")
 
     def _get_secret_name(self) -> Optional[str]:
         """获取secret.yml中的metadata.name"""
         if self.secret_data and 'metadata' in self.secret_data:
             return self.secret_data['metadata'].get('name')
-        print("   ❌ secret.yml中缺少metadata.name")
+        self._report("   ❌ secret.yml中缺少metadata.name")
         return None
 
-    def _find_secret_refs(self, obj: Any, path: str = "") -> List[Tuple[str, str]]:
-        """递归查找所有secretRef引用"""
-        secret_refs = []
+    def _find_secret_refs(self, obj: Any) -> List[str]:
+        """查找所有secretRef引用的name（显式栈迭代，按文档顺序返回）"""
+        ref_names = []
+        # 栈元素: (所在的键, 节点)；子节点逆序入栈以保持先序遍历顺序
+        stack = [(None, obj)]
         
-        if isinstance(obj, dict):
-            for key, value in obj.items():
-                current_path = f"{path}.{key}" if path else key
-                if key == 'secretRef' and isinstance(value, dict) and 'name' in value:
-                    secret_refs.append((value['name'], current_path))
-                else:
-                    secret_refs.extend(self._find_secret_refs(value, current_path))
-        elif isinstance(obj, list):
-            for i, item in enumerate(obj):
-                current_path = f"{path}[{i}]"
-                secret_refs.extend(self._find_secret_refs(item, current_path))
+        while stack:
+            key, node = stack.pop()
+            if key == 'secretRef' and isinstance(node, dict) and 'name' in node:
+                ref_names.append(node['name'])
+            elif isinstance(node, dict):
+                stack.extend(reversed(node.items()))
+            elif isinstance(node, list):
+                stack.extend((None, item) for item in reversed(node))
                 
-        return secret_refs
+        return ref_names
+
+    def _get_file_key(self, file_path: Path) -> Tuple[str, int, int]:
+        """获取文件缓存键（每个文件每次review只stat一次）"""
+        key = self._file_keys.get(file_path)
+        if key is None:
+            key = _file_key(file_path)
+            self._file_keys[file_path] = key
+        return key
+
+    def _load_bytes(self, file_path: Path) -> bytes:
+        """读取文件原始字节"""
+        return _read_bytes_cached(*self._get_file_key(file_path))
+
+    def _parse_file(self, file_path: Path) -> Any:
+        """解析JSON/YAML文件"""
+        return _parse_cached(*self._get_file_key(file_path))
 
     def _read_file_content(self, file_path: Path) -> str:
-        """读取文件内容"""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return f.read()
+        """读取文件文本内容（由缓存的字节解码一次）"""
+        content = self._file_text.get(file_path)
+        if content is None:
+            content = self._load_bytes(file_path).decode('utf-8')
+            self._file_text[file_path] = content
+        return content
 
     def _print_results(self):
         """输出检查结果"""
-        print("\n" + "=" * 60)
-        print("检查结果汇总")
-        print("=" * 60)
+        self._emit("\n" + "=" * 60)
+        self._emit("检查结果汇总")
+        self._emit("=" * 60)
         
         if self.result.has_errors:
-            print(f"❌ 发现 {self.result.total_errors} 个问题:")
+            self._emit(f"❌ 发现 {self.result.total_errors} 个问题:")
             
             if self.result.file_errors:
-                print("\n文件合法性问题:")
+                self._emit("\n文件合法性问题:")
                 for error in self.result.file_errors:
-                    print(f"  - {error}")
+                    self._emit(f"  - {error}")
                     
             if self.result.secret_key_errors:
-                print("\nSecret配置问题:")
+                self._emit("\nSecret配置问题:")
                 for error in self.result.secret_key_errors:
-                    print(f"  - {error}")
+                    self._emit(f"  - {error}")
         else:
-            print("✅ 所有检查都通过了!")
+            self._emit("✅ 所有检查都通过了!")
             
         # 显示统计信息
-        print(f"\n📊 检查统计:")
-        print(f"  - 检查的placeholder数量: {self.result.placeholder_count}")
+        self._emit(f"\n📊 检查统计:")
+        self._emit(f"  - 检查的placeholder数量: {self.result.placeholder_count}")
         if self.dc_file:
-            print(f"  - Secret引用匹配: {'✅ 是' if self.result.secret_ref_match else '❌ 否'}")
+            self._emit(f"  - Secret引用匹配: {'✅ 是' if self.result.secret_ref_match else '❌ 否'}")
             if self.result.secret_ref_names[0]:
-                print(f"  - Secret名称: {self.result.secret_ref_names[0]}")
-                print(f"  - 引用名称: {self.result.secret_ref_names[1]}")
+                self._emit(f"  - Secret名称: {self.result.secret_ref_names[0]}")
+                self._emit(f"  - 引用名称: {self.result.secret_ref_names[1]}")
+
+
+# 每个进程复用同一个reviewer实例，见_review_one
+_worker_reviewer: Optional[ENAASReviewerV2] = None
+
+
+def _review_one(enaas_file: str, secret_file: str, dc_file: Optional[str],
+                verbose: bool = True) -> Tuple[Optional[ReviewResult], str, Optional[str]]:
+    """检查单个文件组合（供进程池调用），返回(检查结果, 检查输出, 失败原因)"""
+    global _worker_reviewer
+    if _worker_reviewer is None:
+        _worker_reviewer = ENAASReviewerV2(enaas_file, secret_file, dc_file, buffered=True, verbose=verbose)
+    else:
+        _worker_reviewer._verbose = verbose
+        _worker_reviewer.reset(enaas_file, secret_file, dc_file)
+    
+    try:
+        result = _worker_reviewer.run_review()
+    except Exception as e:
+        return None, _worker_reviewer._out.getvalue(), str(e)
+    return result, _worker_reviewer._out.getvalue(), None
 
 
 def main():
     """主函数"""
+    # --quiet: 只输出检查结果和汇总，省略逐项检查过程
+    # --no-scan-cache: 自动扫描模式下不读写目录扫描的磁盘缓存
+    verbose = '--quiet' not in sys.argv
+    scan_cache = '--no-scan-cache' not in sys.argv
+    argv = [arg for arg in sys.argv if arg not in ('--quiet', '--no-scan-cache')]
+    
     # 检查是否是自动扫描模式
-    if len(sys.argv) >= 2 and sys.argv[1] == "review openshift manifest":
+    if len(argv) >= 2 and argv[1] == "review openshift manifest":
         print("🔍 启动自动扫描模式...")
         
         # 检查是否指定了目标目录
         target_directory = None
-        if len(sys.argv) == 3:
-            target_directory = sys.argv[2]
+        if len(argv) == 3:
+            target_directory = argv[2]
             print(f"🎯 目标目录: {target_directory}")
         
         # 创建reviewer实例（文件路径不重要，因为我们使用自动扫描）
-        reviewer = ENAASReviewerV2("dummy.json", "dummy.yml")
+        reviewer = ENAASReviewerV2("dummy.json", "dummy.yml", verbose=verbose, scan_cache=scan_cache)
         reviewer.run_batch_review(target_directory)
         return
     
     # 手动指定文件模式
-    if len(sys.argv) < 3 or len(sys.argv) > 4:
+    if len(argv) < 3 or len(argv) > 4:
         print("用法:")
         print("  1. 自动扫描模式:")
         print("     python enaas_reviewer_v2.py 'review openshift manifest'                    # 扫描所有目录")
         print("     python enaas_reviewer_v2.py 'review openshift manifest' <目录名>          # 从根目录寻找并扫描指定目录")
         print("  2. 手动指定文件模式:")
         print("     python enaas_reviewer_v2.py <enaas.json路径> <*_secret.yml路径> [*_dc.yml路径]")
+        print("  以上命令均可追加 --quiet，只输出检查结果和汇总")
+        print("  自动扫描模式可追加 --no-scan-cache，不读写目录扫描缓存（也可设置环境变量 ENAAS_REVIEWER_NO_SCAN_CACHE=1）")
         print("")
         print("示例:")
         print("  # 自动扫描所有目录")
@@ -844,12 +1353,16 @@ def main():
         print("  python enaas_reviewer_v2.py enaas-details.json myapp_secret.yml myapp_dc.yml")
         sys.exit(1)
 
-    enaas_file = sys.argv[1]
-    secret_file = sys.argv[2]
-    dc_file = sys.argv[3] if len(sys.argv) == 4 else None
+    enaas_file = argv[1]
+    secret_file = argv[2]
+    dc_file = argv[3] if len(argv) == 4 else None
 
-    reviewer = ENAASReviewerV2(enaas_file, secret_file, dc_file)
-    result = reviewer.run_review()
+    # 检查过程的输出先写入缓冲区，结束后一次性写出
+    reviewer = ENAASReviewerV2(enaas_file, secret_file, dc_file, buffered=True, verbose=verbose)
+    try:
+        result = reviewer.run_review()
+    finally:
+        sys.stdout.write(reviewer._out.getvalue())
 
     sys.exit(0 if not result.has_errors else 1)
 